@@ -1,6 +1,7 @@
 """
 Simplified adaptive difficulty system for reliable note density control.
 """
+import bisect
 import logging
 import csv
 
@@ -146,41 +147,43 @@ def select_best_onsets(candidates, target_count, y, sr):
         import numpy as np
         
         # Calculate onset strength for each candidate
-        onset_strengths = []
         hop_length = 512
         
-        for onset_time in candidates:
-            frame_idx = int(onset_time * sr // hop_length)
-            if frame_idx < len(y) // hop_length:
-                # Get audio energy around this time
-                start_sample = max(0, int(onset_time * sr) - hop_length)
-                end_sample = min(len(y), int(onset_time * sr) + hop_length)
-                
-                if end_sample > start_sample:
-                    energy = np.mean(np.abs(y[start_sample:end_sample]))
-                else:
-                    energy = 0
-            else:
-                energy = 0
-            
-            onset_strengths.append((onset_time, energy))
+        # Mean absolute amplitude in a +/- hop_length window around every
+        # candidate at once, from a running sum of |y| instead of slicing
+        # the signal per candidate
+        abs_cumsum = np.concatenate(([0.0], np.cumsum(np.abs(y), dtype=np.float64)))
+        centers = (np.asarray(candidates, dtype=np.float64) * sr).astype(np.int64)
+        starts = np.clip(centers - hop_length, 0, len(y))
+        ends = np.clip(centers + hop_length, 0, len(y))
+        widths = ends - starts
+        energies = np.zeros(len(centers))
+        valid = (centers // hop_length < len(y) // hop_length) & (widths > 0)
+        energies[valid] = (abs_cumsum[ends[valid]] - abs_cumsum[starts[valid]]) / widths[valid]
+        
+        onset_strengths = list(zip(candidates, energies.tolist()))
         
         # Sort by energy (strongest first)
         onset_strengths.sort(key=lambda x: x[1], reverse=True)
         
-        # Select top candidates while maintaining minimum spacing
+        # Select top candidates while maintaining minimum spacing; selections
+        # are kept sorted so only the nearest neighbours need checking
         selected = []
         min_spacing = 0.1  # Minimum 0.1 seconds between notes
         
         for onset_time, energy in onset_strengths:
             # Check if this onset is far enough from existing selections
-            if not selected or min([abs(onset_time - prev) for prev in selected]) >= min_spacing:
-                selected.append(onset_time)
-                
-                if len(selected) >= target_count:
-                    break
+            pos = bisect.bisect_left(selected, onset_time)
+            if pos > 0 and onset_time - selected[pos - 1] < min_spacing:
+                continue
+            if pos < len(selected) and selected[pos] - onset_time < min_spacing:
+                continue
+            selected.insert(pos, onset_time)
+            
+            if len(selected) >= target_count:
+                break
         
-        return sorted(selected)
+        return selected
         
     except Exception as e:
         logger.error(f"Error selecting onsets: {e}")
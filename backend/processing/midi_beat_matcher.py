@@ -9,6 +9,7 @@ import random
 import math
 import numpy as np
 from pathlib import Path
+from .utils import get_audio_duration
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -130,13 +131,18 @@ def detect_beats_and_tempo(song_path):
             
     # Calculate duration if possible or use default
     duration = 180.0  # Default 3 minutes
-    try:
-        from pydub import AudioSegment
-        audio = AudioSegment.from_file(song_path)
-        duration = len(audio) / 1000.0
-        logger.info(f"Got duration from pydub: {duration}s")
-    except:
-        logger.warning("Couldn't determine audio duration, using default")
+    header_duration = get_audio_duration(song_path)
+    if header_duration is not None:
+        duration = header_duration
+        logger.info(f"Got duration from file header: {duration}s")
+    else:
+        try:
+            from pydub import AudioSegment
+            audio = AudioSegment.from_file(song_path)
+            duration = len(audio) / 1000.0
+            logger.info(f"Got duration from pydub: {duration}s")
+        except:
+            logger.warning("Couldn't determine audio duration, using default")
     
     # Use default 120 BPM
     tempo = 120.0
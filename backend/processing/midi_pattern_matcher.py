@@ -7,6 +7,7 @@ import logging
 import random
 import numpy as np
 from pathlib import Path
+from .utils import get_audio_duration
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -150,13 +151,15 @@ def detect_audio_tempo(audio_path):
         tempo = 120.0
         beat_duration = 60.0 / tempo
         
-        # Get audio duration
-        try:
-            from pydub import AudioSegment
-            audio = AudioSegment.from_file(audio_path)
-            duration = len(audio) / 1000.0
-        except:
-            duration = 180.0  # Default 3 minutes
+        # Get audio duration, from the file header if possible
+        duration = get_audio_duration(audio_path)
+        if duration is None:
+            try:
+                from pydub import AudioSegment
+                audio = AudioSegment.from_file(audio_path)
+                duration = len(audio) / 1000.0
+            except:
+                duration = 180.0  # Default 3 minutes
             
         # Generate beats starting at 3.0s
         num_beats = int((duration - 3.0) / beat_duration)
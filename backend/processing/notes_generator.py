@@ -2,12 +2,21 @@
 Standard notes generator that uses audio analysis to detect drum hits and create appropriate patterns.
 """
 import os
-import csv
 import sys
+import math
+import locale
 import logging
 import warnings
+import functools
+import itertools
+import operator
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import random
+import hashlib
+import tempfile
 from .utils import format_time, format_bpm, format_percentage, format_safe
 
 try:
@@ -37,6 +46,314 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Preformatted notes.csv pieces for generators that skip the csv module.
+# Lines use csv.writer's "\r\n" terminator, and the bytes header is encoded
+# the way a text-mode open() would encode it; row suffixes follow the time
+# column.
+NOTES_CSV_HEADER_LINE = "Time [s],Enemy Type,Aux Color 1,Aux Color 2,Nº Enemies,interval,Aux\r\n"
+NOTES_CSV_HEADER = NOTES_CSV_HEADER_LINE.encode(locale.getpreferredencoding(False))
+ROW_KICK = b",1,2,2,1,,7\r\n"
+ROW_SNARE = b",1,2,2,1,,7\r\n"
+ROW_HIHAT = b",1,1,1,1,,6\r\n"
+ROW_CRASH = b",2,5,6,1,,5\r\n"
+
+def _build_fixed_pattern_cycle():
+    """
+    Rows emitted at each half-second tick of the fixed fallback pattern's
+    16-tick (8 second) cycle, as (template, row count) pairs. Each template
+    takes the tick's whole seconds and centiseconds once per row.
+    """
+    cycle = []
+    for tick in range(16):
+        if tick % 4 == 0:
+            # Every 2 seconds: kick + hihat
+            rows = [ROW_KICK, ROW_HIHAT]
+        elif tick % 4 == 2:
+            # Every 2 seconds offset by 1: snare + hihat
+            rows = [ROW_SNARE, ROW_HIHAT]
+        else:
+            # Just hihat on other beats
+            rows = [ROW_HIHAT]
+        
+        # Add crash every 8 seconds
+        if tick == 0:
+            rows.append(ROW_CRASH)
+        
+        cycle.append((b"".join(b"%d.%02d" + row for row in rows), len(rows)))
+    return tuple(cycle)
+
+FIXED_PATTERN_TEMPLATES, FIXED_PATTERN_ROW_COUNTS = zip(*_build_fixed_pattern_cycle())
+
+def _write_bytes(output_path, data):
+    """
+    Write a preformatted bytes-like payload to output_path through a raw
+    file descriptor, bypassing the text and buffered I/O layers. Every
+    notes.csv writer in this module goes through here. New files get the
+    same permissions open() would give them (0o666 less the umask).
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(output_path, flags, 0o666)
+    try:
+        # os.write may write less than requested, so loop over 1 MiB slices
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view[:1 << 20])
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+# Whether generate_notes_csv places notes from the multi-band drum analysis.
+# That path could never complete before (it failed on undefined names, so
+# every song fell back to the adaptive basic pattern); switching it on
+# changes every generated chart, so it stays off until that is released
+# as a change of its own. While it is off, the MIDI file is not parsed and
+# the audio is not analysed.
+DRUM_SYNCED_NOTES_ENABLED = False
+
+# Sample rate used for tempo and onset analysis. The analysed bands stop at
+# 8kHz, so anything above this Nyquist frequency only makes every FFT larger.
+ANALYSIS_SAMPLE_RATE = 22050
+
+def _load_audio(path, sr=None):
+    """
+    Load an audio file as mono float32, resampled to sr if given
+    (otherwise at its native sample rate).
+    Reads through soundfile directly when it can decode the file, which
+    avoids librosa's audioread buffering, and falls back to librosa.load.
+    """
+    try:
+        import soundfile as sf
+        with sf.SoundFile(path) as f:
+            native_sr = f.samplerate
+            
+            # Downmix block by block into one preallocated float32 buffer,
+            # so the full multi-channel signal is never held in memory
+            y = np.empty(max(f.frames, 0), dtype=np.float32)
+            pos = 0
+            for block in f.blocks(blocksize=1 << 16, dtype='float32', always_2d=True):
+                end = pos + len(block)
+                if end > len(y):
+                    # Frame count in the header was short; grow the buffer
+                    y = np.concatenate([y[:pos], np.empty(max(end - pos, len(y)), dtype=np.float32)])
+                np.mean(block, axis=1, out=y[pos:end])
+                pos = end
+            y = y[:pos]
+    except Exception:
+        import librosa
+        return librosa.load(path, sr=sr)
+    
+    if sr is not None and sr != native_sr:
+        import librosa
+        y = librosa.resample(y, orig_sr=native_sr, target_sr=sr)
+        return y, sr
+    return y, native_sr
+
+def _analysis_n_fft(n_samples):
+    """
+    FFT size used for onset analysis. Short signals get a smaller window
+    rather than a zero-padded one.
+    """
+    return min(2048, 1 << (n_samples - 1).bit_length())
+
+def _analysis_stft(y):
+    """Complex STFT of y (hop length 512) shared by the analysis steps."""
+    import librosa
+    return librosa.stft(y, n_fft=_analysis_n_fft(len(y)), hop_length=512)
+
+def _power_spectrogram(D):
+    """
+    |D|**2 for a complex STFT, from the real and imaginary parts directly
+    rather than taking a square root for the magnitude and squaring it.
+    """
+    return np.square(D.real) + np.square(D.imag)
+
+def _percussive_component(y, D=None):
+    """
+    Separate the percussive part of y and return it as a time-domain signal.
+    D can be passed in when the STFT of y was already computed.
+    The onset analysis takes its spectrogram from the returned signal rather
+    than from the separated STFT, so a cached signal gives the same chart.
+    """
+    import librosa
+    n_fft = _analysis_n_fft(len(y))
+    if D is None:
+        D = _analysis_stft(y)
+    _, D_percussive = librosa.decompose.hpss(D)
+    return librosa.istft(D_percussive, n_fft=n_fft, hop_length=512, length=len(y))
+
+# Mel bands in the onset envelopes used for tempo estimation; drum hits
+# stand out just as well with a coarser filter bank than librosa's 128
+TEMPO_ONSET_MELS = 40
+
+def _estimate_tempo(y, sr, onset_envelope=None, hop_length=512, S=None):
+    """
+    Estimate the global tempo in BPM as a plain float, from y, from its
+    power spectrogram S, or from a precomputed onset envelope.
+    This is the same estimate beat_track starts from, without the dynamic
+    programming pass that places the individual beats.
+    """
+    import librosa
+    if onset_envelope is None and S is not None:
+        # Same log-mel envelope onset_strength builds from y, but projected
+        # from an STFT that is already available
+        mel = librosa.feature.melspectrogram(S=S, sr=sr, n_mels=TEMPO_ONSET_MELS)
+        onset_envelope = librosa.onset.onset_strength(S=librosa.power_to_db(mel), sr=sr)
+    elif onset_envelope is None:
+        onset_envelope = librosa.onset.onset_strength(
+            y=y, sr=sr, hop_length=hop_length, n_mels=TEMPO_ONSET_MELS)
+    tempo_fn = getattr(librosa.feature, 'tempo', None) or librosa.beat.tempo
+    tempo = tempo_fn(y=y, sr=sr, onset_envelope=onset_envelope, hop_length=hop_length)
+    return float(np.atleast_1d(tempo)[0])
+
+def _summarize_audio(song_path):
+    """
+    Return (duration, tempo, mean_rms) for a song without holding the whole
+    decoded signal in memory: the mel spectrogram behind the onset envelope
+    and the RMS are built block by block while streaming the file. Falls
+    back to a full load for formats that can't be streamed.
+    """
+    import librosa
+    hop_length, frame_length = 512, 2048
+    try:
+        import soundfile as sf
+        sr = librosa.get_samplerate(song_path)
+        duration = sf.info(song_path).duration
+        
+        mel_blocks = []
+        rms_blocks = []
+        for block in librosa.stream(song_path, block_length=256, frame_length=frame_length,
+                                    hop_length=hop_length, mono=True, dtype=np.float32):
+            if len(block) < frame_length:
+                continue  # Trailing partial block
+            mel_blocks.append(librosa.feature.melspectrogram(
+                y=block, sr=sr, n_fft=frame_length, hop_length=hop_length, center=False,
+                n_mels=TEMPO_ONSET_MELS))
+            rms_blocks.append(librosa.feature.rms(
+                y=block, frame_length=frame_length, hop_length=hop_length, center=False)[0])
+        
+        if not mel_blocks:
+            raise ValueError("audio too short to stream")
+        
+        # The onset envelope is taken over the joined spectrogram rather than
+        # per block, so the flux across block boundaries is kept and the dB
+        # floor is relative to the whole song, as for the unstreamed signal
+        mel_db = librosa.power_to_db(np.concatenate(mel_blocks, axis=1))
+        onset_envelope = librosa.onset.onset_strength(
+            S=mel_db, sr=sr, hop_length=hop_length, center=False)
+        tempo = _estimate_tempo(None, sr, onset_envelope=onset_envelope, hop_length=hop_length)
+        return duration, tempo, float(np.mean(np.concatenate(rms_blocks)))
+    
+    except Exception:
+        y, sr = _load_audio(song_path, sr=ANALYSIS_SAMPLE_RATE)
+        return len(y) / sr, _estimate_tempo(y, sr), float(librosa.feature.rms(y=y)[0].mean())
+
+# On-disk cache of per-song analysis results, keyed by a hash of the audio file
+ANALYSIS_CACHE_DIR = Path(tempfile.gettempdir()) / "beatmapper_cache"
+
+# Only the first and last this many bytes of the audio file are hashed;
+# together with the file's size and mtime this identifies a song without
+# reading all of it on every call
+ANALYSIS_CACHE_KEY_BYTES = 1 << 20
+
+# Bump whenever the cached analysis is computed differently, so entries
+# written by older code are not reused
+ANALYSIS_CACHE_VERSION = 5
+
+# Total size the cache directory may grow to; the least recently used
+# entries are deleted beyond it (each entry holds a song's percussive signal)
+ANALYSIS_CACHE_MAX_BYTES = 512 << 20
+
+def _analysis_cache_path(song_path):
+    """
+    Return the cache file for song_path, keyed by its size, its mtime and a
+    SHA-1 of its first and last ANALYSIS_CACHE_KEY_BYTES bytes. The end of
+    the file is included because songs can share a large leading tag block
+    (e.g. embedded cover art), and the mtime catches edits anywhere else.
+    """
+    with open(song_path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        digest = hashlib.sha1(f.read(ANALYSIS_CACHE_KEY_BYTES))
+        if st.st_size > ANALYSIS_CACHE_KEY_BYTES:
+            f.seek(max(ANALYSIS_CACHE_KEY_BYTES, st.st_size - ANALYSIS_CACHE_KEY_BYTES))
+            digest.update(f.read())
+        digest.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+    return ANALYSIS_CACHE_DIR / f"{digest.hexdigest()}_{ANALYSIS_SAMPLE_RATE}_v{ANALYSIS_CACHE_VERSION}.npz"
+
+def _load_cached_analysis(cache_path):
+    """
+    Load cached (sr, song_duration, tempo, y_percussive) for a song,
+    or return None if there is no usable cache entry.
+    y_percussive is None when it was not needed on the run that cached it.
+    """
+    try:
+        with np.load(cache_path) as data:
+            y_percussive = data['y_percussive'] if data['has_percussive'] else None
+            cached = (int(data['sr']), float(data['song_duration']), float(data['tempo']),
+                      y_percussive)
+    except Exception:
+        return None
+    
+    # Mark the entry as recently used for _prune_analysis_cache
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return cached
+
+def _save_cached_analysis(cache_path, sr, song_duration, tempo, y_percussive=None):
+    """Store analysis results for a song; failures only cost a cache miss next time."""
+    temp_path = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Write to a uniquely named file and move it into place, so workers
+        # caching the same song never write into each other's partial file
+        with tempfile.NamedTemporaryFile(dir=cache_path.parent, suffix='.tmp', delete=False) as f:
+            temp_path = f.name
+            np.savez_compressed(
+                f, sr=sr, song_duration=song_duration,
+                tempo=float(np.atleast_1d(tempo)[0]),
+                has_percussive=y_percussive is not None,
+                y_percussive=y_percussive if y_percussive is not None else np.zeros(0, dtype=np.float32)
+            )
+        os.replace(temp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"Could not cache analysis results: {e}")
+        if temp_path is not None:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        return
+    
+    _prune_analysis_cache(cache_path.parent)
+
+def _prune_analysis_cache(cache_dir, max_bytes=ANALYSIS_CACHE_MAX_BYTES):
+    """
+    Delete the least recently used cache entries in cache_dir until the
+    entries left fit in max_bytes. Loading an entry updates its mtime, so
+    mtime order is last-use order.
+    """
+    try:
+        entries = []
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.npz') and entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Already removed by another worker
+            total -= size
+    except OSError as e:
+        logger.warning(f"Could not prune analysis cache: {e}")
+
 def extract_midi_beats(midi_path):
     """
     Extract beat timings from a MIDI file.
@@ -93,7 +410,20 @@ def extract_midi_beats(midi_path):
         logger.error(f"Error processing MIDI file: {e}")
         return []
 
-def generate_notes_csv(song_path, midi_path, output_path, target_difficulty=None, progress_callback=None):
+def _notes_csv_up_to_date(output_path, *input_paths):
+    """
+    Check whether output_path exists and is at least as new as every input
+    file that exists (missing or unset inputs are ignored).
+    """
+    try:
+        output_mtime = os.path.getmtime(output_path)
+        return all(os.path.getmtime(path) <= output_mtime
+                   for path in input_paths if path and os.path.exists(path))
+    except OSError:
+        return False
+
+def generate_notes_csv(song_path, midi_path, output_path, target_difficulty=None, progress_callback=None,
+                       skip_if_up_to_date=False):
     """
     Generate notes based on audio analysis and beat detection.
     This is the standard generator that balances accuracy and performance.
@@ -105,6 +435,9 @@ def generate_notes_csv(song_path, midi_path, output_path, target_difficulty=None
         target_difficulty: Optional target difficulty level ("EASY", "MEDIUM", "HARD", "EXTREME")
                           If provided, note density will be adjusted to match this difficulty
         progress_callback: Optional callback function(progress_percent, message) for progress updates
+        skip_if_up_to_date: Keep an existing output_path that is newer than the song and MIDI
+                            files instead of regenerating it. Only use this when the target
+                            difficulty is the same as on the run that wrote it.
           Returns:
         bool: True if successful, False otherwise
     """
@@ -114,6 +447,11 @@ def generate_notes_csv(song_path, midi_path, output_path, target_difficulty=None
         if progress_callback:
             progress_callback(percent, message)
     
+    if skip_if_up_to_date and _notes_csv_up_to_date(output_path, song_path, midi_path):
+        logger.info(f"{output_path} is up to date, skipping note generation")
+        report_progress(100, "Notes already up to date")
+        return True
+    
     try:
         logger.info(f"Generating standard drum notes for {os.path.basename(song_path)}")
         report_progress(0, "Initializing note generation...")
@@ -170,6 +508,12 @@ def generate_notes_csv(song_path, midi_path, output_path, target_difficulty=None
                 report_progress(15, "Adaptive system error, using fallback...")
                 # Fall through to original system
         
+        # MIDI beats and the audio analysis below only feed the drum-synced
+        # path, so skip both when it is disabled
+        if not DRUM_SYNCED_NOTES_ENABLED:
+            logger.info("Drum-synced generation is disabled, using adaptive basic pattern")
+            return generate_adaptive_basic_pattern(song_path, output_path)
+        
         report_progress(20, "Checking for MIDI file...")
         
         # Check if MIDI file is provided for enhanced detection
@@ -198,28 +542,53 @@ def generate_notes_csv(song_path, midi_path, output_path, target_difficulty=None
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore")
                 
-                # Load the audio file
-                y, sr = librosa.load(song_path, sr=None)
-                report_progress(45, "Audio loaded, analyzing duration and tempo...")
-                
-                # Get song duration
-                song_duration = librosa.get_duration(y=y, sr=sr)
-                logger.info(f"Song duration: {{format_time(song_duration)}}")
-                
-                # Detect the tempo
-                tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
-                logger.info(f"Detected tempo: {{format_bpm(tempo)}}")
-                report_progress(55, f"Tempo detected: {{format_bpm(tempo)}}")
+                # Reuse earlier analysis of the same audio if available
+                cache_path = _analysis_cache_path(song_path)
+                cached = _load_cached_analysis(cache_path)
+                cache_stale = cached is None
+                if cached is not None:
+                    y = D = None
+                    sr, song_duration, tempo, y_percussive = cached
+                    logger.info("Using cached tempo analysis")
+                    report_progress(55, f"Tempo loaded from cache: {{format_bpm(tempo)}}")
+                else:
+                    # Load the audio file
+                    y, sr = _load_audio(song_path, sr=ANALYSIS_SAMPLE_RATE)
+                    report_progress(45, "Audio loaded, analyzing duration and tempo...")
+                    
+                    # Get song duration
+                    song_duration = len(y) / sr
+                    logger.info(f"Song duration: {{format_time(song_duration)}}")
+                    
+                    # Detect the tempo; note placement comes from onsets, so the
+                    # individual beat positions are not tracked. The STFT is
+                    # kept for the percussive separation below
+                    D = _analysis_stft(y)
+                    tempo = _estimate_tempo(y, sr, S=_power_spectrogram(D))
+                    logger.info(f"Detected tempo: {{format_bpm(tempo)}}")
+                    report_progress(55, f"Tempo detected: {{format_bpm(tempo)}}")
+                    
+                    y_percussive = None
                 
                 # Try to extract drums using spleeter if available
-                drums_y = try_extract_drums_with_spleeter(song_path)
+                drums_y = try_extract_drums_with_spleeter(song_path, sr=sr)
                 if drums_y is not None:
                     logger.info("Using isolated drum track for better detection")
                     y_for_analysis = drums_y
                 else:
                     # If spleeter not available, use percussive component
-                    y_harmonic, y_percussive = librosa.effects.hpss(y)
+                    if y_percussive is None:
+                        if y is None:
+                            y, sr = _load_audio(song_path, sr=ANALYSIS_SAMPLE_RATE)
+                        y_percussive = _percussive_component(y, D=D)
+                        cache_stale = True
                     y_for_analysis = y_percussive
+                D = None  # Full-mix STFT is not needed past this point
+                
+                # Write the cache entry once, after the percussive signal (if
+                # this run needed it) is known
+                if cache_stale:
+                    _save_cached_analysis(cache_path, sr, song_duration, tempo, y_percussive)
                 
                 # Detect bands for multi-band analysis
                 optimized_bands = [
@@ -228,22 +597,14 @@ def generate_notes_csv(song_path, midi_path, output_path, target_difficulty=None
                     (300, 1000),  # Snare/mid toms
                     (1000, 4000), # Hi-hats/cymbals
                     (4000, 8000), # Rides/crashes
-                ]                # Generate notes based on detected beats and audio analysis
-                # Use MIDI beats if available, otherwise use librosa beats
-                if midi_beats and len(midi_beats) > 0:
-                    logger.info("Using MIDI beats for enhanced accuracy")
-                    # Convert MIDI beat times to frame indices for compatibility
-                    midi_beat_frames = librosa.time_to_frames(midi_beats, sr=sr)
-                    success = generate_drum_synced_notes(
-                        y_for_analysis, sr, song_duration, tempo, midi_beat_frames, 
-                        output_path, optimized_bands, use_midi=True, target_difficulty=target_difficulty
-                    )
-                else:
-                    logger.info("Using audio-detected beats")
-                    success = generate_drum_synced_notes(
-                        y_for_analysis, sr, song_duration, tempo, beats, 
-                        output_path, optimized_bands, use_midi=False, target_difficulty=target_difficulty
-                    )
+                ]
+                
+                # Generate notes from the audio analysis, noting the MIDI beats if available
+                success = generate_drum_synced_notes(
+                    y_for_analysis, sr, song_duration, tempo, output_path, optimized_bands,
+                    midi_beats=midi_beats, target_difficulty=target_difficulty,
+                    progress_callback=progress_callback
+                )
                 
                 if success:
                     logger.info(f"Successfully generated notes.csv at {output_path}")
@@ -261,74 +622,253 @@ def generate_notes_csv(song_path, midi_path, output_path, target_difficulty=None
         logger.error(f"Failed to generate notes.csv: {str(e)}")
         return False
 
-def try_extract_drums_with_spleeter(song_path):
+def _generate_notes_job(job, target_difficulty=None, skip_if_up_to_date=False):
+    """Run one (song_path, midi_path, output_path) job in a worker process."""
+    song_path, midi_path, output_path = job
+    return generate_notes_csv(song_path, midi_path, output_path, target_difficulty=target_difficulty,
+                              skip_if_up_to_date=skip_if_up_to_date)
+
+# Native thread pools used by numpy/scipy/librosa; batch workers are limited
+# to one thread each so parallel processes don't oversubscribe the cores
+WORKER_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS",
+                          "MKL_NUM_THREADS", "NUMBA_NUM_THREADS")
+
+def _init_notes_worker():
+    """
+    Set up a batch worker process: run its native libraries single-threaded
+    (values the user set explicitly are left alone) and import the analysis
+    libraries once. Only the worker's own environment is changed.
+    """
+    explicit = {name for name in WORKER_THREAD_ENV_VARS if name in os.environ}
+    
+    # Read by libraries that start their thread pools later in the worker
+    for name in WORKER_THREAD_ENV_VARS:
+        os.environ.setdefault(name, "1")
+    
+    if _module_available("librosa"):
+        import librosa  # noqa: F401
+    
+    # numpy and scipy were imported with this module, before the variables
+    # above were set, so their running pools are capped directly
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    if "OMP_NUM_THREADS" not in explicit:
+        threadpool_limits(1, user_api="openmp")
+    if not explicit & {"OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"}:
+        threadpool_limits(1, user_api="blas")
+
+def generate_notes_csv_batch(jobs, target_difficulty=None, max_workers=None, skip_if_up_to_date=False):
+    """
+    Generate notes.csv files for many songs in parallel worker processes.
+    Each worker imports librosa and builds the spleeter separator once and
+    reuses them for every song it is given. Workers run their native
+    libraries single-threaded, since the parallelism comes from the pool.
+    
+    Args:
+        jobs: Iterable of (song_path, midi_path, output_path) tuples
+        target_difficulty: Target difficulty applied to every song
+        max_workers: Number of worker processes (defaults to CPU count)
+        skip_if_up_to_date: Keep outputs that are newer than their song and MIDI files
+        
+    Returns:
+        list: Success flag for each job, in input order
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    
+    # Spawn fresh workers so none inherit TensorFlow state from the parent
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=context,
+            initializer=_init_notes_worker) as executor:
+        job_fn = functools.partial(_generate_notes_job, target_difficulty=target_difficulty,
+                                   skip_if_up_to_date=skip_if_up_to_date)
+        return list(executor.map(job_fn, jobs))
+
+@functools.lru_cache(maxsize=None)
+def _module_available(name):
+    """
+    Check (once per process) whether a module is installed, so fallbacks
+    don't retry a failing import on every call. Installing optional modules
+    is left to the installer scripts, never the processing path.
+    """
+    import importlib.util
+    return importlib.util.find_spec(name) is not None
+
+# Set when spleeter is installed but fails to import, so later songs skip
+# straight to the full mix
+_SPLEETER_IMPORT_FAILED = False
+
+def _configure_spleeter_gpus():
+    """
+    Let TensorFlow grow GPU memory on demand so spleeter runs on small GPUs.
+    TensorFlow places the model on a GPU by itself when one is visible;
+    otherwise separation stays on the CPU.
+    """
+    try:
+        import tensorflow as tf
+        gpus = tf.config.list_physical_devices('GPU')
+        for gpu in gpus:
+            tf.config.experimental.set_memory_growth(gpu, True)
+        if gpus:
+            logger.info(f"Spleeter will use {len(gpus)} GPU(s)")
+        else:
+            logger.info("No GPU found, spleeter will run on CPU")
+    except Exception as e:
+        logger.info(f"Could not configure GPUs for spleeter, using defaults: {e}")
+
+# Spleeter separator shared across songs, built on first use
+_SPLEETER_SEPARATOR = None
+_SPLEETER_SEPARATOR_LOCK = threading.Lock()
+
+def _get_spleeter_separator():
+    """
+    Return the shared 4-stem spleeter separator, loading the model only once
+    per process instead of once per song.
+    """
+    global _SPLEETER_SEPARATOR
+    with _SPLEETER_SEPARATOR_LOCK:
+        if _SPLEETER_SEPARATOR is None:
+            _configure_spleeter_gpus()
+            from spleeter.separator import Separator
+            _SPLEETER_SEPARATOR = Separator('spleeter:4stems', multiprocess=False)
+        return _SPLEETER_SEPARATOR
+
+def try_extract_drums_with_spleeter(song_path, sr=None):
     """
     Try to extract drums from the audio file using spleeter if available.
-    Returns isolated drum track or None if not available.
+    Returns isolated drum track (resampled to sr if given, otherwise at
+    spleeter's 44.1kHz) or None if not available.
     """
+    global _SPLEETER_IMPORT_FAILED
+    if _SPLEETER_IMPORT_FAILED or not _module_available("spleeter"):
+        logger.info("Spleeter not available, using full mix for analysis")
+        return None
+    
     try:
-        # First check if spleeter is installed
-        import spleeter
-        from spleeter.separator import Separator
-        import tempfile
-        import librosa
+        from spleeter.audio.adapter import AudioAdapter
         
         logger.info("Spleeter found, attempting to isolate drums")
         
-        # Create temporary directory for spleeter output
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Initialize the separator
-            separator = Separator('spleeter:4stems')
-            
-            # Process the audio file
-            separator.separate_to_file(song_path, temp_dir)
-            
-            # Get the base name of the file without extension
-            base_name = os.path.splitext(os.path.basename(song_path))[0]
+        # Separate in memory rather than writing every stem to disk and
+        # reading the drums back; the model works at 44.1kHz
+        spleeter_sr = 44100
+        waveform, _ = AudioAdapter.default().load(song_path, sample_rate=spleeter_sr)
+        stems = _get_spleeter_separator().separate(waveform)
+        
+        # Downmix the isolated drums to mono
+        drums = stems.get('drums')
+        if drums is not None and len(drums) > 0:
+            drums_y = np.asarray(drums, dtype=np.float32).mean(axis=1)
             
-            # Load the isolated drums
-            drums_path = os.path.join(temp_dir, base_name, 'drums.wav')
-            if os.path.exists(drums_path):
-                drums_y, sr = librosa.load(drums_path, sr=None)
-                logger.info("Successfully isolated drum track")
-                return drums_y
+            # Match the sample rate the rest of the analysis runs at
+            if sr is not None and sr != spleeter_sr:
+                import librosa
+                drums_y = librosa.resample(drums_y, orig_sr=spleeter_sr, target_sr=sr)
+            logger.info("Successfully isolated drum track")
+            return drums_y
         
         logger.warning("Failed to isolate drums with spleeter")
         return None
         
-    except ImportError:
-        logger.info("Spleeter not available, using full mix for analysis")
+    except ImportError as e:
+        # Installed but not importable (e.g. a broken TensorFlow install);
+        # remember that so later songs skip straight to the full mix
+        _SPLEETER_IMPORT_FAILED = True
+        logger.info(f"Spleeter could not be imported ({e}), using full mix for analysis")
         return None
     except Exception as e:
         logger.warning(f"Error using spleeter: {str(e)}")
         return None
 
-def generate_drum_synced_notes(y, sr, song_duration, tempo, beats, output_path, optimized_bands=None, use_midi=False, target_difficulty=None):
+# Note characteristics (enemy type, color 1, color 2, aux) indexed by event code.
+# Codes follow the frequency band order; the last code is also used for crashes.
+BAND_NOTE_TYPES = [
+    (1, 2, 2, 7),  # Kick drum (lowest band)
+    (1, 3, 3, 7),  # Low toms
+    (1, 2, 2, 7),  # Snare/mid toms
+    (1, 1, 1, 6),  # Hi-hats/cymbals
+    (2, 5, 6, 5),  # Rides/crashes (highest band)
+]
+CRASH_CODE = len(BAND_NOTE_TYPES) - 1
+
+# First event code with the same note characteristics, so codes that would
+# write identical rows (e.g. kick and snare) compare equal
+BAND_ROW_IDS = tuple(BAND_NOTE_TYPES.index(note_type) for note_type in BAND_NOTE_TYPES)
+
+# Complete CSV line template for each event code; only the time is filled in
+BAND_ROW_TEMPLATES = tuple(
+    f"%.2f,{enemy_type},{color1},{color2},1,,{aux}\r\n".encode("ascii")
+    for enemy_type, color1, color2, aux in BAND_NOTE_TYPES
+)
+
+def _enforce_min_spacing(onset_times, min_spacing):
     """
-    Generate notes based on detected beats and multi-band analysis.
+    Keep onsets greedily so that each kept onset is at least min_spacing
+    after the previous kept one (the first must be min_spacing after 0).
+    Jumps straight to the next candidate with a binary search, so dense
+    runs of onsets are skipped without visiting each one.
+    """
+    kept = []
+    last_note_time = 0
+    start = 0
+    n = len(onset_times)
+    while start < n:
+        idx = int(np.searchsorted(onset_times, last_note_time + min_spacing, side='left'))
+        idx = max(idx, start)
+        # Settle float rounding so the test matches onset - last >= spacing
+        while idx > start and onset_times[idx - 1] - last_note_time >= min_spacing:
+            idx -= 1
+        while idx < n and onset_times[idx] - last_note_time < min_spacing:
+            idx += 1
+        if idx >= n:
+            break
+        last_note_time = onset_times[idx]
+        kept.append(idx)
+        start = idx + 1
+    return onset_times[kept]
+
+def _distance_to_nearest(times, anchors):
+    """
+    Distance from each of times to the closest of the sorted anchors
+    (infinite when there are no anchors).
+    """
+    if len(anchors) == 0:
+        return np.full(len(times), np.inf)
+    pos = np.searchsorted(anchors, times)
+    before = anchors[np.clip(pos - 1, 0, len(anchors) - 1)]
+    after = anchors[np.clip(pos, 0, len(anchors) - 1)]
+    return np.minimum(np.abs(times - before), np.abs(times - after))
+
+def generate_drum_synced_notes(y, sr, song_duration, tempo, output_path, optimized_bands=None, midi_beats=None, target_difficulty=None, progress_callback=None):
+    """
+    Generate notes based on the tempo and multi-band onset analysis.
     This is the main algorithm for the standard generator.
     
     Args:
-        use_midi: Whether the beats come from MIDI (True) or audio analysis (False)
+        midi_beats: Optional beat times (seconds) extracted from a MIDI file
         target_difficulty: Target difficulty level to adjust note density
+        progress_callback: Optional callback function(progress_percent, message) for progress updates
     """
+    
+    def report_progress(percent, message):
+        """Helper to report progress"""
+        if progress_callback:
+            progress_callback(percent, message)
+    
     try:
         import librosa
         
-        # Convert beats from frames to time
-        if use_midi:
-            # If using MIDI, beats are already frame indices from time conversion
-            beat_times = librosa.frames_to_time(beats, sr=sr)
-            logger.info(f"Using {len(beat_times)} MIDI-derived beat times")
-        else:
-            # Audio-detected beats are frame indices
-            beat_times = librosa.frames_to_time(beats, sr=sr)
-            logger.info(f"Using {len(beat_times)} audio-detected beat times")
+        # Notes are placed from onsets, so MIDI beats are only reported here
+        if midi_beats:
+            logger.info(f"Using {len(midi_beats)} MIDI-derived beats")
         
-        # Get seconds per beat
+        # Get seconds per beat (callers may pass tempo as a 1-element array)
+        tempo = float(np.atleast_1d(tempo)[0])
         spb = 60 / tempo
-          # Detect onsets with multiple band approach
-        onsets_by_band = multi_band_onset_detection(y, sr, optimized_bands, base_threshold=threshold)
         
         # Calculate adaptive spacing between notes based on tempo        
         min_spacing = calculate_adaptive_beat_spacing(tempo)
@@ -363,8 +903,12 @@ def generate_drum_synced_notes(y, sr, song_duration, tempo, beats, output_path,
                 pass            
             logger.info(f"Using original difficulty system: {target_difficulty} (spacing multiplier: {multiplier})")
 
+        # Compute the power spectrogram once and share it between the
+        # threshold estimate and the multi-band onset detection
+        S = _power_spectrogram(_analysis_stft(y))
+        
         # Calculate adaptive thresholds based on audio characteristics
-        threshold = calculate_adaptive_threshold(y, sr, tempo)
+        threshold = calculate_adaptive_threshold(y, sr, tempo, S=S)
         
         # Apply difficulty-based threshold adjustments
         if target_difficulty:
@@ -387,86 +931,74 @@ def generate_drum_synced_notes(y, sr, song_duration, tempo, beats, output_path,
             
             logger.info(f"Adjusted threshold for {target_difficulty}: {threshold:.3f}")
         
+        # Detect onsets with multiple band approach
+        onsets_by_band = multi_band_onset_detection(y, sr, optimized_bands, base_threshold=threshold, S=S)
+        
         report_progress(85, "Processing audio onsets and generating notes...")
         
-        # Prepare to write CSV
-        with open(output_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            
-            # Header row
-            writer.writerow(["Time [s]", "Enemy Type", "Aux Color 1", "Aux Color 2", "Nº Enemies", "interval", "Aux"])
-            
-            report_progress(90, "Writing note data to CSV...")
-            
-            # Start at 3.0s to match MIDI reference
-            start_offset = 3.0
-            
-            # Track last note time by band to avoid overcrowding
-            last_note_time = {i: 0 for i in range(len(optimized_bands))}
-            
-            # For each band, add notes based on onsets
-            for band_idx, band_onsets in enumerate(onsets_by_band):
-                # Define note characteristics based on frequency band
-                if band_idx == 0:  # Kick drum (lowest band)
-                    enemy_type, color1, color2, aux = 1, 2, 2, 7
-                elif band_idx == 1:  # Low toms
-                    enemy_type, color1, color2, aux = 1, 3, 3, 7
-                elif band_idx == 2:  # Snare/mid toms
-                    enemy_type, color1, color2, aux = 1, 2, 2, 7
-                elif band_idx == 3:  # Hi-hats/cymbals
-                    enemy_type, color1, color2, aux = 1, 1, 1, 6
-                else:  # Rides/crashes (highest band)
-                    enemy_type, color1, color2, aux = 2, 5, 6, 5
-                
-                # Process onsets for this band
-                for onset_time in band_onsets:
-                    # Only add if after start_offset
-                    if onset_time >= start_offset:
-                        # Check if we should add a note here (respect minimum spacing)
-                        if onset_time - last_note_time[band_idx] >= min_spacing:
-                            # Round to 2 decimal places for consistent timing
-                            note_time = round(onset_time, 2)
-                            
-                            # Write the note to CSV
-                            writer.writerow([
-                                f"{note_time:.2f}",
-                                str(enemy_type),
-                                str(color1),
-                                str(color2),
-                                "1",
-                                "",
-                                str(aux)
-                            ])
-                            
-                            # Update last note time for this band
-                            last_note_time[band_idx] = onset_time
+        # Start at 3.0s to match MIDI reference
+        start_offset = 3.0
+        
+        # Collect every event as parallel time/code arrays, one block per source
+        event_times = []
+        event_codes = []
+        
+        # For each band, add notes based on onsets
+        for band_idx, band_onsets in enumerate(onsets_by_band):
+            # Only add if after start_offset
+            band_onsets = np.asarray(band_onsets, dtype=np.float64)
+            band_onsets = band_onsets[band_onsets >= start_offset]
             
-            # Add occasional crashes at downbeats (first beat of measure)
-            measure_length = 4 * spb  # 4 beats per measure
-            current_measure = 0
-            measure_start = start_offset
+            # Respect minimum spacing between notes of the same band
+            band_times = _enforce_min_spacing(band_onsets, min_spacing)
             
-            while measure_start < song_duration:
-                # Add crash at beginning and every 8 measures
-                if current_measure % 8 == 0:
-                    writer.writerow([
-                        f"{measure_start:.2f}",
-                        "2",  # Crash type
-                        "5",  # Crash color 1
-                        "6",  # Crash color 2
-                        "1",
-                        "",
-                        "5"   # Crash aux
-                    ])
-                
-                # Move to next measure
-                measure_start += measure_length
-                current_measure += 1
-              # Log the total number of notes generated
-            with open(output_path, 'r') as f:
-                note_count = sum(1 for _ in f) - 1  # Subtract 1 for header
-                logger.info(f"Generated {note_count} notes")
-                report_progress(100, f"Note generation completed! Generated {note_count} notes")
+            event_times.append(np.round(band_times, 2))
+            event_codes.append(np.full(len(band_times), min(band_idx, CRASH_CODE), dtype=np.int32))
+        
+        # Add occasional crashes at downbeats: beginning and every 8 measures
+        measure_length = 4 * spb  # 4 beats per measure
+        crash_times = np.arange(start_offset, song_duration, 8 * measure_length)
+        
+        # A detected crash just before or after a downbeat crash is the same
+        # hit, so drop detected crashes closer than min_spacing to one
+        for block, (times, codes) in enumerate(zip(event_times, event_codes)):
+            doubled = (codes == CRASH_CODE) & (_distance_to_nearest(times, crash_times) < min_spacing)
+            event_times[block] = times[~doubled]
+            event_codes[block] = codes[~doubled]
+        
+        event_times.append(crash_times)
+        event_codes.append(np.full(len(crash_times), CRASH_CODE, dtype=np.int32))
+        
+        # Merge all sources and sort by time once
+        all_times = np.concatenate(event_times)
+        all_codes = np.concatenate(event_codes)
+        order = np.argsort(all_times, kind='stable')
+        all_times = all_times[order]
+        all_codes = all_codes[order]
+        
+        # Drop repeated identical notes that land in the same 10ms slot,
+        # e.g. a detected crash on a downbeat crash, keeping the first one
+        time_slots = np.rint(all_times * 100).astype(np.int64)
+        _, first_idx = np.unique(time_slots * len(BAND_NOTE_TYPES) + np.asarray(BAND_ROW_IDS)[all_codes], return_index=True)
+        keep = np.sort(first_idx)
+        all_times = all_times[keep]
+        all_codes = all_codes[keep]
+        
+        report_progress(90, "Writing note data to CSV...")
+        
+        # Every field is a plain number, so lines are formatted directly
+        # rather than going through a csv writer, and the whole file is
+        # built in memory and written with a single call
+        csv_body = b"".join(
+            BAND_ROW_TEMPLATES[code] % note_time
+            for note_time, code in zip(all_times.tolist(), all_codes.tolist())
+        )
+        _write_bytes(output_path, NOTES_CSV_HEADER + csv_body)
+        
+        # Log the total number of notes generated
+        note_count = len(all_times)
+        logger.info(f"Generated {note_count} notes")
+        report_progress(100, f"Note generation completed! Generated {note_count} notes")
         
         return True
     
@@ -474,13 +1006,14 @@ def generate_drum_synced_notes(y, sr, song_duration, tempo, beats, output_path,
         logger.error(f"Error in drum-synced note generation: {str(e)}")
         return False
 
-def multi_band_onset_detection(y, sr, bands=None, base_threshold=0.3):
+def multi_band_onset_detection(y, sr, bands=None, base_threshold=0.3, S=None):
     """
     Detect onsets in multiple frequency bands for more accurate drum hit detection.
     Returns a list of onset times for each frequency band.
     
     Args:
         base_threshold: Base threshold for onset detection (can be adjusted by difficulty)
+        S: Optional precomputed power spectrogram of y (hop length 512)
     """
     try:
         import librosa
@@ -495,15 +1028,28 @@ def multi_band_onset_detection(y, sr, bands=None, base_threshold=0.3):
             ]
         
         onsets_by_band = []
-        
-        for low_freq, high_freq in bands:
-            # Filter the audio to the band
-            y_band = librosa.effects.remix(y, intervals=librosa.frequency_bands.frequency_filter(
-                y, sr, low_freq, high_freq))
-            
-            # Compute onset envelope for this band
-            onset_env = librosa.onset.onset_strength(y=y_band, sr=sr)
-              # Adaptive threshold based on the band and base threshold
+
+        # Compute the spectrogram once and look up the band edges against a
+        # single frequency axis instead of filtering the signal per band
+        if S is None:
+            S = _power_spectrogram(_analysis_stft(y))
+        n_fft = 2 * (S.shape[0] - 1)
+        S_db = librosa.power_to_db(S, ref=np.max)
+        freqs = librosa.fft_frequencies(sr=sr, n_fft=n_fft)
+        band_bins = [np.searchsorted(freqs, [low_freq, high_freq]) for low_freq, high_freq in bands]
+
+        # Compute every band's onset envelope in one pass over the spectrogram
+        onset_envs = librosa.onset.onset_strength_multi(
+            S=S_db, sr=sr,
+            channels=[slice(low_bin, max(high_bin, low_bin + 1)) for low_bin, high_bin in band_bins]
+        )
+
+        # Peak picking windows in frames (30ms max, 80ms average)
+        max_frames = int(0.03 * sr // 512)
+        avg_frames = int(0.08 * sr // 512)
+
+        for (low_freq, high_freq), onset_env in zip(bands, onset_envs):
+            # Adaptive threshold based on the band and base threshold
             # Lower bands (kick, bass) need higher thresholds
             if low_freq < 150:
                 threshold = base_threshold * 1.33  # 0.4 default
@@ -517,11 +1063,11 @@ def multi_band_onset_detection(y, sr, bands=None, base_threshold=0.3):
             # Detect onsets
             onset_frames = librosa.onset.onset_detect(
                 onset_envelope=onset_env, sr=sr,
-                threshold=threshold,
-                pre_max=0.03*sr//512,
-                post_max=0.03*sr//512,
-                pre_avg=0.08*sr//512,
-                post_avg=0.08*sr//512
+                delta=threshold,
+                pre_max=max_frames,
+                post_max=max_frames,
+                pre_avg=avg_frames,
+                post_avg=avg_frames
             )
             
             # Convert to time
@@ -534,9 +1080,10 @@ def multi_band_onset_detection(y, sr, bands=None, base_threshold=0.3):
         logger.error(f"Error in multi-band onset detection: {str(e)}")
         return []
 
-def calculate_adaptive_threshold(y, sr, tempo):
+def calculate_adaptive_threshold(y, sr, tempo, S=None):
     """
     Calculate adaptive threshold for onset detection based on audio characteristics.
+    S is an optional precomputed power spectrogram of y (hop length 512).
     """
     try:
         import librosa
@@ -544,12 +1091,16 @@ def calculate_adaptive_threshold(y, sr, tempo):
         # Calculate overall RMS energy
         rms = np.mean(librosa.feature.rms(y=y)[0])
         
-        # Calculate spectral flatness (measure of noisiness)
-        flatness = np.mean(librosa.feature.spectral_flatness(y=y)[0])
+        if S is None:
+            S = _power_spectrogram(librosa.stft(y, hop_length=512))
         
-        # More percussive = lower threshold needed
-        y_harmonic, y_percussive = librosa.effects.hpss(y)
-        perc_ratio = np.sum(y_percussive**2) / (np.sum(y_harmonic**2) + 1e-10)
+        # More percussive = lower threshold needed. Separate on the
+        # spectrogram and compare energies there instead of resynthesizing
+        # both halves of the signal. On a power spectrogram, power=1 soft
+        # masks equal the default power=2 masks on magnitudes, and each
+        # half's energy is its squared mask times the power.
+        mask_harmonic, mask_percussive = librosa.decompose.hpss(S, power=1.0, mask=True)
+        perc_ratio = np.sum(mask_percussive**2 * S) / (np.sum(mask_harmonic**2 * S) + 1e-10)
         
         # Base threshold adjusted by audio characteristics
         base_threshold = 0.3
@@ -598,23 +1149,93 @@ def calculate_adaptive_beat_spacing(tempo):
         # Very fast tempo - even larger spacing
         return base_spacing * 1.5
 
+# Cheap sanity checks before attempting to decode a file for analysis
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.flac', '.ogg', '.m4a')
+MIN_AUDIO_BYTES = 4096
+
+def _analysis_skip_reason(song_path):
+    """
+    Return why song_path is not worth decoding for analysis, or None if it is.
+    Only looks at the path and file size, never the audio contents.
+    song_path may be a str or any path-like object.
+    """
+    if not song_path or not os.path.isfile(song_path):
+        return "file not found"
+    if os.path.splitext(os.fspath(song_path))[1].lower() not in AUDIO_EXTENSIONS:
+        return "unsupported extension"
+    if os.path.getsize(song_path) < MIN_AUDIO_BYTES:
+        return "file too small"
+    return None
+
+# CSV fields after the time column for the basic patterns
+FIELDS_KICK = ("1", "2", "2", "1", "", "7")
+FIELDS_SNARE = ("1", "2", "2", "1", "", "7")
+FIELDS_HIHAT = ("1", "1", "1", "1", "", "6")
+FIELDS_CRASH = ("2", "5", "6", "1", "", "5")
+
+def _build_step_cycle(note_divisor, fill_hihat):
+    """
+    Build the CSV lines emitted on each step of an 8-step basic pattern
+    phrase, as (template, row count) pairs; each template takes the step
+    time once per row.
+    Kick/snare + hihat land every note_divisor steps, with optional hihat
+    fills in between and a crash at the start of the phrase.
+    """
+    cycle = []
+    for step in range(8):
+        rows = []
+        if step % note_divisor == 0:
+            # Kick and snare alternate but currently share the same note type
+            rows.append(FIELDS_KICK if (step // note_divisor) % 2 == 0 else FIELDS_SNARE)
+            rows.append(FIELDS_HIHAT)
+        elif fill_hihat:
+            rows.append(FIELDS_HIHAT)
+        if step == 0:
+            rows.append(FIELDS_CRASH)
+        template = "".join("%.2f," + ",".join(fields) + "\r\n" for fields in rows)
+        cycle.append((template.encode("ascii"), len(rows)))
+    return tuple(cycle)
+
+BASIC_STEP_CYCLE = _build_step_cycle(4, fill_hihat=False)
+ADAPTIVE_STEP_CYCLES = {
+    "normal": _build_step_cycle(2, fill_hihat=False),  # 8th notes
+    "dense": _build_step_cycle(4, fill_hihat=True),    # 16th notes with hihat fills
+}
+
+def _step_cycle_lines(step_cycle, start_time, note_spacing, song_duration):
+    """
+    Return an iterator of CSV bytes for a basic pattern, one chunk per step,
+    by walking its phrase table from start_time to the end of the song.
+    """
+    templates, row_counts = zip(*step_cycle)
+    
+    # Step times are a running sum of the spacing (the same float additions
+    # as stepping a loop variable), generated and formatted by C iterators
+    times = itertools.takewhile(
+        functools.partial(operator.gt, song_duration),
+        itertools.accumulate(itertools.repeat(note_spacing), initial=start_time)
+    )
+    template_args = map(operator.mul, zip(times), itertools.cycle(row_counts))
+    return map(operator.mod, itertools.cycle(templates), template_args)
+
 def generate_adaptive_basic_pattern(song_path, output_path, song_duration=180.0):
     """
     Generate a basic pattern but with adaptive parameters based on song analysis.
     Used as a fallback when detailed analysis fails.
     """
     try:
+        skip_reason = _analysis_skip_reason(song_path)
+        if skip_reason:
+            logger.info(f"Skipping analysis of {song_path} ({skip_reason}), using fixed pattern")
+            return generate_fixed_basic_notes_csv(output_path, song_duration)
+        
         # Estimate duration and tempo if possible
         try:
-            import librosa
-            y, sr = librosa.load(song_path, sr=None)
-            song_duration = librosa.get_duration(y=y, sr=sr)
-            
-            # Try to detect tempo
-            tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
+            if not _module_available("librosa"):
+                raise ImportError("librosa is not installed")
             
-            # Analyze energy level
-            rms = librosa.feature.rms(y=y)[0].mean()
+            # Get duration, tempo and energy level in one streaming pass
+            song_duration, tempo, rms = _summarize_audio(song_path)
             
             # Adjust pattern density based on energy
             if rms > 0.1:
@@ -629,53 +1250,15 @@ def generate_adaptive_basic_pattern(song_path, output_path, song_duration=180.0)
         # Get seconds per beat
         spb = 60 / tempo
         
-        with open(output_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            
-            # Header row
-            writer.writerow(["Time [s]", "Enemy Type", "Aux Color 1", "Aux Color 2", "Nº Enemies", "interval", "Aux"])
-            
-            # Start at 3.0s to match MIDI reference
-            current_time = 3.0
-            
-            # Generate beats until the end of the song
-            beat_count = 0
-            measure = 0
-            
-            # Use 16th note spacing for dense patterns, 8th for normal
-            note_divisor = 4 if pattern_type == "dense" else 2
-            note_spacing = spb / note_divisor
-            
-            while current_time < song_duration:
-                # Calculate position in measure
-                beat_in_measure = beat_count % 4
-                
-                # On main beats (quarter notes)
-                if beat_count % note_divisor == 0:
-                    # Beat 1 and 3: kick + hihat
-                    if beat_in_measure == 0 or beat_in_measure == 2:
-                        writer.writerow([f"{current_time:.2f}", "1", "2", "2", "1", "", "7"])  # Kick
-                        writer.writerow([f"{current_time:.2f}", "1", "1", "1", "1", "", "6"])  # Hihat
-                    # Beat 2 and 4: snare + hihat
-                    else:
-                        writer.writerow([f"{current_time:.2f}", "1", "2", "2", "1", "", "7"])  # Snare
-                        writer.writerow([f"{current_time:.2f}", "1", "1", "1", "1", "", "6"])  # Hihat
-                
-                # For dense patterns, add hihat on 16th notes
-                elif pattern_type == "dense":
-                    writer.writerow([f"{current_time:.2f}", "1", "1", "1", "1", "", "6"])  # Hihat
-                
-                # Add crash at start of each 8-beat phrase
-                if beat_count % 8 == 0:
-                    writer.writerow([f"{current_time:.2f}", "2", "5", "6", "1", "", "5"])  # Crash
-                
-                # Move to next note time
-                current_time += note_spacing
-                beat_count += 1
-                
-                # Every 4 beats is a measure
-                if beat_count % 4 == 0:
-                    measure += 1
+        # Use 16th note spacing for dense patterns, 8th for normal
+        note_divisor = 4 if pattern_type == "dense" else 2
+        note_spacing = spb / note_divisor
+        
+        # Header row, then beats from 3.0s (to match the MIDI reference)
+        # until the end of the song
+        lines = _step_cycle_lines(
+            ADAPTIVE_STEP_CYCLES[pattern_type], 3.0, note_spacing, song_duration)
+        _write_bytes(output_path, b"".join(itertools.chain((NOTES_CSV_HEADER,), lines)))
         
         logger.info(f"Generated adaptive basic pattern at {output_path}")
         return True
@@ -694,54 +1277,32 @@ def generate_basic_notes_csv(song_path, output_path, song_duration=180.0):
     Generate a very basic notes.csv file as a last resort fallback.
     """
     try:
+        skip_reason = _analysis_skip_reason(song_path)
+        if skip_reason:
+            logger.info(f"Skipping analysis of {song_path} ({skip_reason}), using fixed pattern")
+            return generate_fixed_basic_notes_csv(output_path, song_duration)
+        
         # Estimate duration if possible
         try:
-            import librosa
-            y, sr = librosa.load(song_path, sr=None)
-            song_duration = librosa.get_duration(y=y, sr=sr)
+            if not _module_available("librosa"):
+                raise ImportError("librosa is not installed")
             
-            # Try to detect tempo
-            tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
+            # Get duration and tempo in one streaming pass
+            song_duration, tempo, _ = _summarize_audio(song_path)
         except:
             tempo = 120  # Default tempo
         
         # Get seconds per beat
         spb = 60 / tempo
         
-        with open(output_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            
-            # Header row
-            writer.writerow(["Time [s]", "Enemy Type", "Aux Color 1", "Aux Color 2", "Nº Enemies", "interval", "Aux"])
-            
-            # Use 16th note spacing (~0.22s) to match MIDI
-            sixteenth_note = spb / 4
-            
-            # Start at 3.0s to match MIDI reference
-            current_time = 3.0
-            
-            # Generate beats until the end of the song
-            beat_count = 0
-            
-            while current_time < song_duration:
-                # On main beats (quarter notes)
-                if beat_count % 4 == 0:
-                    # Alternate between kick and snare
-                    if (beat_count // 4) % 2 == 0:
-                        writer.writerow([f"{current_time:.2f}", "1", "2", "2", "1", "", "7"])  # Kick
-                    else:
-                        writer.writerow([f"{current_time:.2f}", "1", "2", "2", "1", "", "7"])  # Snare
-                    
-                    # Add hihat on every beat
-                    writer.writerow([f"{current_time:.2f}", "1", "1", "1", "1", "", "6"])  # Hihat
-                    
-                    # Add crash every 8 beats
-                    if beat_count % 8 == 0:
-                        writer.writerow([f"{current_time:.2f}", "2", "5", "6", "1", "", "5"])  # Crash
-                
-                # Move to next 16th note
-                current_time += sixteenth_note
-                beat_count += 1
+        # Use 16th note spacing (~0.22s) to match MIDI
+        sixteenth_note = spb / 4
+        
+        # Header row, then beats from 3.0s (to match the MIDI reference)
+        # until the end of the song; quarter notes get kick/snare + hihat,
+        # with a crash every 8 beats
+        lines = _step_cycle_lines(BASIC_STEP_CYCLE, 3.0, sixteenth_note, song_duration)
+        _write_bytes(output_path, b"".join(itertools.chain((NOTES_CSV_HEADER,), lines)))
         
         logger.info(f"Generated basic pattern at {output_path}")
         return True
@@ -750,40 +1311,40 @@ def generate_basic_notes_csv(song_path, output_path, song_duration=180.0):
         logger.error(f"Failed to generate basic notes.csv: {str(e)}")
         return False
 
+# Fixed pattern timing
+FIXED_START_TIME = 3.0      # Start at 3 seconds
+FIXED_TIME_INCREMENT = 0.5  # Half-second notes
+
+@functools.lru_cache(maxsize=64)
+def _fixed_pattern_bytes(num_ticks):
+    """
+    Build the complete fixed-pattern CSV for num_ticks ticks.
+    The pattern is fully deterministic, so the result is cached per tick count.
+    """
+    # Times are exact in centiseconds, so they are split into whole seconds
+    # and centiseconds with integer arithmetic instead of float formatting
+    start_centis = int(FIXED_START_TIME * 100)
+    step_centis = int(FIXED_TIME_INCREMENT * 100)
+    centis = range(start_centis, start_centis + num_ticks * step_centis, step_centis)
+    tick_times = zip(map(operator.floordiv, centis, itertools.repeat(100)),
+                     map(operator.mod, centis, itertools.repeat(100)))
+    
+    # Each tick fills its cycle template with its time once per row; the
+    # whole pipeline runs in C iterators and is joined into one buffer
+    template_args = map(operator.mul, tick_times, itertools.cycle(FIXED_PATTERN_ROW_COUNTS))
+    lines = map(operator.mod, itertools.cycle(FIXED_PATTERN_TEMPLATES), template_args)
+    return b"".join(itertools.chain((NOTES_CSV_HEADER,), lines))
+
 def generate_fixed_basic_notes_csv(output_path, song_duration=180.0):
     """
     Generate a fixed pattern with no external dependencies as a last resort.
     """
     try:
-        with open(output_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Time [s]", "Enemy Type", "Aux Color 1", "Aux Color 2", "Nº Enemies", "interval", "Aux"])
-            
-            # Generate a very simple fixed pattern
-            time_increment = 0.5  # Half-second notes
-            current_time = 3.0    # Start at 3 seconds
-            
-            while current_time < song_duration:
-                # Alternate between different note types
-                tick = int((current_time - 3.0) / time_increment)
-                
-                if tick % 4 == 0:
-                    # Every 2 seconds: kick + hihat
-                    writer.writerow([f"{current_time:.2f}", "1", "2", "2", "1", "", "7"])  # Kick 
-                    writer.writerow([f"{current_time:.2f}", "1", "1", "1", "1", "", "6"])  # Hihat
-                elif tick % 4 == 2:
-                    # Every 2 seconds offset by 1: snare + hihat
-                    writer.writerow([f"{current_time:.2f}", "1", "2", "2", "1", "", "7"])  # Snare
-                    writer.writerow([f"{current_time:.2f}", "1", "1", "1", "1", "", "6"])  # Hihat
-                else:
-                    # Just hihat on other beats
-                    writer.writerow([f"{current_time:.2f}", "1", "1", "1", "1", "", "6"])  # Hihat
-                
-                # Add crash every 8 seconds
-                if tick % 16 == 0:
-                    writer.writerow([f"{current_time:.2f}", "2", "5", "6", "1", "", "5"])  # Crash
-                
-                current_time += time_increment
+        # The whole timeline is known up front, so the output only depends
+        # on how many half-second ticks fit after the start time
+        num_ticks = max(0, math.ceil((song_duration - FIXED_START_TIME) / FIXED_TIME_INCREMENT))
+        
+        _write_bytes(output_path, _fixed_pattern_bytes(num_ticks))
         
         logger.info(f"Generated fixed basic pattern at {output_path}")
         return True
@@ -792,9 +1353,34 @@ def generate_fixed_basic_notes_csv(output_path, song_duration=180.0):
         logger.error(f"Failed to generate fixed basic pattern: {str(e)}")
         return False
 
-def add_enhanced_pattern_variation(base_pattern, tempo):
+def _generate_fixed_job(job):
+    """Run one (output_path, song_duration) job in a worker process."""
+    output_path, song_duration = job
+    return generate_fixed_basic_notes_csv(output_path, song_duration)
+
+def generate_fixed_basic_notes_csv_batch(jobs, max_workers=None):
     """
-    Add more natural variations to patterns like those found in MIDI files
+    Generate fixed patterns for many songs in parallel.
+    
+    Args:
+        jobs: Iterable of (output_path, song_duration) pairs
+        max_workers: Number of worker processes (defaults to CPU count)
+        
+    Returns:
+        list: Success flag for each job, in input order
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    
+    # Each job is short and independent, so hand them out in large chunks
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_generate_fixed_job, jobs, chunksize=8))
+
+def add_enhanced_pattern_variation(base_pattern, tempo, seed=None):
+    """
+    Add more natural variations to patterns like those found in MIDI files.
+    Pass a seed to make the chosen variations reproducible.
     """
     varied_pattern = []
     
@@ -812,21 +1398,24 @@ def add_enhanced_pattern_variation(base_pattern, tempo):
     ]
     
     # Use pattern variations based on section of song
-    section_length = int(len(base_pattern) / 4)
-    for i in range(0, len(base_pattern), section_length):
+    section_length = max(1, len(base_pattern) // 4)
+    section_starts = range(0, len(base_pattern), section_length)
+
+    # Draw every section's decisions up front from one local generator
+    rng = random.Random(seed)
+    draw = rng.random
+    apply_variation = [draw() < 0.3 for _ in section_starts]
+    variations = [midi_like_variations[int(draw() * len(midi_like_variations))] for _ in section_starts]
+
+    for section_idx, i in enumerate(section_starts):
         section = base_pattern[i:i+section_length]
-        
+
         # Apply different variations to each drum element
-        if random.random() < 0.3:
-            # Add or remove notes based on MIDI-like patterns
-            var_index = random.randint(0, len(midi_like_variations)-1)
-            variation = midi_like_variations[var_index]
-            
-            for j, (time, note_type) in enumerate(section):
-                if j % 8 < len(variation) and variation[j % 8] == 0:
-                    # Skip this note based on variation pattern
-                    continue
-                varied_pattern.append((time, note_type))
+        if apply_variation[section_idx]:
+            # Add or remove notes based on MIDI-like patterns, skipping
+            # notes where the repeating 8-step variation mask is 0
+            variation = variations[section_idx]
+            varied_pattern.extend(itertools.compress(section, itertools.cycle(variation)))
         else:
             varied_pattern.extend(section)
     
@@ -843,6 +1432,7 @@ typical_patterns = [
 
 if __name__ == "__main__":
     import sys
+    multiprocessing.freeze_support()
     if len(sys.argv) > 2:
         generate_notes_csv(sys.argv[1], None, sys.argv[2])
     else:
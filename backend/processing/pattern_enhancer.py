@@ -1,9 +1,9 @@
 """
 Tools for enhancing note patterns with greater variation and dynamics
 """
-import os
 import csv
-import random
+import bisect
+import warnings
 import numpy as np
 import logging
 from collections import defaultdict
@@ -11,19 +11,24 @@ from collections import defaultdict
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def identify_pattern_sections(notes_csv_path, measures_per_section=8):
+def load_note_times(notes_csv_path):
     """
-    Identify logical sections in the song based on note patterns
+    Load the time column of a notes CSV
     
     Args:
         notes_csv_path: Path to notes CSV
-        measures_per_section: How many measures to consider a section
         
     Returns:
-        list: [(start_time, end_time, section_type), ...]
+        list: Note times in file order, skipping rows without a valid time
     """
     try:
-        # Load notes
+        # Parse the column in numpy's C reader (quietly, for files with
+        # only a header)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            return np.loadtxt(notes_csv_path, delimiter=',', skiprows=1, usecols=0, ndmin=1).tolist()
+    except ValueError:
+        # Blank or malformed times; parse row by row and skip those rows
         times = []
         with open(notes_csv_path, 'r') as f:
             reader = csv.reader(f)
@@ -34,6 +39,22 @@ def identify_pattern_sections(notes_csv_path, measures_per_section=8):
                         times.append(float(row[0]))
                     except ValueError:
                         continue
+        return times
+
+def identify_pattern_sections(notes_csv_path, measures_per_section=8):
+    """
+    Identify logical sections in the song based on note patterns
+    
+    Args:
+        notes_csv_path: Path to notes CSV
+        measures_per_section: How many measures to consider a section
+        
+    Returns:
+        list: [(start_time, end_time, section_type), ...]
+    """
+    try:
+        # Load notes
+        times = load_note_times(notes_csv_path)
         
         if not times:
             return []
@@ -95,25 +116,19 @@ def find_common_intervals(intervals, precision=0.01):
     # Count occurrences
     unique, counts = np.unique(rounded_intervals, return_counts=True)
     
-    # Create and sort interval-count pairs
-    interval_counts = [(float(interval), int(count)) 
-                      for interval, count in zip(unique, counts)]
-    interval_counts.sort(key=lambda x: x[1], reverse=True)
-    
-    # Get top 5 most common intervals
-    if len(interval_counts) > 0:
-        top_intervals = interval_counts[:min(5, len(interval_counts))]
-        return top_intervals
-    
-    return []
+    # Get top 5 most common intervals; the stable sort keeps equally common
+    # intervals in ascending order, and only the top 5 become Python pairs
+    top = np.argsort(-counts, kind='stable')[:5]
+    return list(zip(unique[top].tolist(), counts[top].tolist()))
 
-def add_fills_and_variations(notes_csv_path, output_path=None):
+def add_fills_and_variations(notes_csv_path, output_path=None, rng=None):
     """
     Add drum fills and pattern variations at appropriate section transitions
     
     Args:
         notes_csv_path: Path to input notes.csv
         output_path: Path for enhanced output (defaults to overwrite input)
+        rng: Optional numpy random Generator (a fresh one is used if None)
         
     Returns:
         bool: Success or failure
@@ -130,100 +145,208 @@ def add_fills_and_variations(notes_csv_path, output_path=None):
             return False
         
         # Load original notes
-        all_rows = []
-        with open(notes_csv_path, 'r') as f:
-            reader = csv.reader(f)
-            header = next(reader)
-            all_rows = list(reader)
-        
-        # Convert to time-keyed dictionary for easier processing
-        original_notes = {}
-        for row in all_rows:
-            if row and len(row) > 0:
-                try:
-                    time_val = float(row[0])
-                    if time_val not in original_notes:
-                        original_notes[time_val] = []
-                    original_notes[time_val].append(row)
-                except ValueError:
-                    pass
-        
-        # Create a new set of notes with fills and variations
-        enhanced_notes = []
-        
-        # Process each section
-        for i, (start_time, end_time, section_type) in enumerate(sections):
-            # Different pattern types for different sections
-            if section_type == "A":
-                # Standard pattern - keep as is
-                for time in sorted(original_notes.keys()):
-                    if start_time <= time < end_time - 2.0:  # Leave room for fill
-                        enhanced_notes.extend(original_notes[time])
-                        
-            elif section_type == "B":
-                # Variation pattern - we'll vary note types and densities
-                for time in sorted(original_notes.keys()):
-                    if start_time <= time < end_time - 2.0:
-                        # Get notes at this time
-                        notes_at_time = original_notes[time]
-                        
-                        # Randomly modify some notes
-                        for note in notes_at_time:
-                            # 15% chance to modify a note type
-                            if random.random() < 0.15:
-                                # Change note type (column 1)
-                                if note[1] == "1":  # If "enemy type" is 1
-                                    note[1] = "2"
-                                    
-                            enhanced_notes.append(note)
-            
-            # Add fill at end of section (if not the last section)
-            if i < len(sections) - 1:
-                # Create a drum fill in the last 1-2 seconds of section
-                fill_start = max(3.0, end_time - 2.0)
-                fill_end = end_time
-                
-                fill_notes = create_drum_fill(fill_start, fill_end)
-                enhanced_notes.extend(fill_notes)
+        header, all_rows = read_notes_csv(notes_csv_path)
         
-        # Sort by time
-        enhanced_notes.sort(key=lambda row: float(row[0]) if row and len(row) > 0 else 0)
+        filtered_notes = add_fills_to_rows(all_rows, sections, rng=rng)
         
-        # Make sure no notes are too close together
-        filtered_notes = []
-        last_time = 0
+        # Write back
+        write_notes_csv(output_path, header, filtered_notes)
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error adding fills and variations: {e}")
+        return False
+
+def add_fills_to_rows(all_rows, sections, rng=None):
+    """
+    Add drum fills and pattern variations to note rows already in memory
+    
+    Args:
+        all_rows: Note rows (without header)
+        sections: List of (start, end, type) tuples
+        rng: Optional numpy random Generator (a fresh one is used if None)
         
-        for row in enhanced_notes:
-            current_time = float(row[0])
+    Returns:
+        list: Enhanced rows sorted by time
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    # Convert to time-keyed dictionary for easier processing
+    original_notes = {}
+    for row in all_rows:
+        if row and len(row) > 0:
+            try:
+                time_val = float(row[0])
+                if time_val not in original_notes:
+                    original_notes[time_val] = []
+                original_notes[time_val].append(row)
+            except ValueError:
+                pass
+    
+    # Create a new set of notes with fills and variations
+    enhanced_notes = []
+    
+    # Sort the note times once; each section takes its slice by bisection
+    sorted_times = sorted(original_notes.keys())
+    
+    # Process each section
+    for i, (start_time, end_time, section_type) in enumerate(sections):
+        # Times in [start_time, end_time - 2.0), leaving room for the fill
+        section_times = sorted_times[bisect.bisect_left(sorted_times, start_time):
+                                     bisect.bisect_left(sorted_times, end_time - 2.0)]
+        
+        # Different pattern types for different sections
+        if section_type == "A":
+            # Standard pattern - keep as is
+            for time in section_times:
+                enhanced_notes.extend(original_notes[time])
+                    
+        elif section_type == "B":
+            # Variation pattern - we'll vary note types and densities
+            section_notes = [note for time in section_times for note in original_notes[time]]
+            
+            # Randomly modify some notes: 15% chance each to modify a note type
+            modify = rng.random(len(section_notes)) < 0.15
+            for note, modified in zip(section_notes, modify):
+                # Change note type (column 1)
+                if modified and note[1] == "1":  # If "enemy type" is 1
+                    note[1] = "2"
+                    
+            enhanced_notes.extend(section_notes)
+        
+        # Add fill at end of section (if not the last section)
+        if i < len(sections) - 1:
+            # Create a drum fill in the last 1-2 seconds of section
+            fill_start = max(3.0, end_time - 2.0)
+            fill_end = end_time
             
-            if current_time - last_time >= 0.05 or last_time == 0:
-                filtered_notes.append(row)
-                last_time = current_time
+            fill_notes = create_drum_fill(fill_start, fill_end, rng=rng)
+            enhanced_notes.extend(fill_notes)
+    
+    # Sort by time
+    enhanced_notes, times = sort_rows_by_time(enhanced_notes)
+    
+    # Make sure no notes are too close together
+    filtered_notes = [enhanced_notes[i] for i in spaced_note_indices(times, 0.05)]
+    
+    logger.info(f"Added fills and variations, resulting in {len(filtered_notes)} notes")
+    return filtered_notes
+
+def sort_rows_by_time(rows):
+    """
+    Stable sort of note rows by their time column, parsing each time once
+    
+    Args:
+        rows: Note rows (without header)
         
-        # Write back
+    Returns:
+        tuple: (sorted rows, their times as a list of floats)
+    """
+    times = np.fromiter((float(row[0]) if row and len(row) > 0 else 0 for row in rows),
+                        dtype=np.float64, count=len(rows))
+    order = np.argsort(times, kind='stable')
+    return [rows[i] for i in order.tolist()], times[order].tolist()
+
+def read_notes_csv(notes_csv_path):
+    """
+    Read a notes CSV into its header and rows
+    
+    Args:
+        notes_csv_path: Path to notes CSV
+        
+    Returns:
+        tuple: (header, rows)
+    """
+    with open(notes_csv_path, 'r') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        return header, list(reader)
+
+def write_notes_csv(output_path, header, rows):
+    """
+    Write notes CSV rows the way csv.writer would, as one block of text
+    
+    Args:
+        output_path: Path for the CSV file
+        header: Header row
+        rows: Note rows (lists of strings)
+    """
+    body = "".join([",".join(row) + "\r\n" for row in rows])
+    
+    # Plain joining only matches csv.writer when no field needs quoting;
+    # any quote, line break or embedded comma shows up in these counts
+    expected_commas = sum(map(len, rows)) - sum(1 for row in rows if row)
+    if '"' in body or body.count("\n") != len(rows) or body.count("\r") != len(rows) \
+            or body.count(",") != expected_commas:
         with open(output_path, 'w', newline='') as f:
             writer = csv.writer(f)
             writer.writerow(header)
-            writer.writerows(filtered_notes)
-        
-        logger.info(f"Added fills and variations, resulting in {len(filtered_notes)} notes")
-        return True
+            writer.writerows(rows)
+        return
     
-    except Exception as e:
-        logger.error(f"Error adding fills and variations: {e}")
-        return False
+    with open(output_path, 'w', newline='', buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        f.write(body)
 
-def create_drum_fill(start_time, end_time):
+def spaced_note_indices(times, min_spacing):
+    """
+    Pick notes greedily so each kept note is at least min_spacing after the
+    previously kept one (notes right after one at time 0 are always kept)
+    
+    Args:
+        times: Sorted note times
+        min_spacing: Minimum gap between kept notes in seconds
+        
+    Returns:
+        list: Indices of the kept notes
+    """
+    kept = []
+    i = 0
+    while i < len(times):
+        kept.append(i)
+        last_time = times[i]
+        if last_time == 0:
+            i += 1
+            continue
+        
+        # Jump to the first note far enough after this one, then settle the
+        # boundary with the same subtraction the spacing rule uses
+        i = bisect.bisect_left(times, last_time + min_spacing, i + 1)
+        while i < len(times) and times[i] - last_time < min_spacing:
+            i += 1
+        while i - 1 > kept[-1] and times[i - 1] - last_time >= min_spacing:
+            i -= 1
+    return kept
+
+# Fields after the time column for the notes used in fills
+FILL_KICK = ["1", "2", "2", "1", "", "7"]
+FILL_SNARE = ["1", "2", "2", "1", "", "7"]
+FILL_HIHAT = ["1", "1", "1", "1", "", "6"]
+FILL_CRASH = ["2", "5", "6", "1", "", "5"]
+FILL_TOMS = [
+    ["1", "3", "3", "1", "", "7"],
+    ["1", "3", "4", "1", "", "7"],
+    ["1", "4", "4", "1", "", "7"],
+]
+FILL_ELEMENTS = [FILL_KICK, FILL_SNARE, FILL_HIHAT, FILL_CRASH]
+
+def create_drum_fill(start_time, end_time, rng=None):
     """
     Create a drum fill between given start and end times
     
     Args:
         start_time: Fill start time in seconds
         end_time: Fill end time in seconds
+        rng: Optional numpy random Generator (a fresh one is used if None)
         
     Returns:
         list: Rows for a drum fill
     """
+    if rng is None:
+        rng = np.random.default_rng()
+    
     fill_notes = []
     fill_duration = end_time - start_time
     
@@ -233,19 +356,13 @@ def create_drum_fill(start_time, end_time):
     
     # Choose a fill type
     fill_types = ["basic", "snare_roll", "tom_fill", "complex"]
-    fill_type = random.choice(fill_types)
+    fill_type = fill_types[rng.integers(len(fill_types))]
     
     if fill_type == "basic":
-        # Simple quarter-note fill
+        # Simple quarter-note fill, alternating snare and kick
         num_notes = int(fill_duration / 0.25)
-        for i in range(num_notes):
-            time = start_time + i * 0.25
-            
-            # Alternate snare and kick
-            if i % 2 == 0:
-                fill_notes.append([f"{time:.2f}", "1", "2", "2", "1", "", "7"])  # Snare
-            else:
-                fill_notes.append([f"{time:.2f}", "1", "2", "2", "1", "", "7"])  # Kick
+        fill_notes = [[f"{start_time + i * 0.25:.2f}"] + (FILL_SNARE if i % 2 == 0 else FILL_KICK)
+                      for i in range(num_notes)]
                 
     elif fill_type == "snare_roll":
         # Snare roll with increasing density
@@ -253,48 +370,33 @@ def create_drum_fill(start_time, end_time):
         time = start_time
         
         while time < end_time - 0.5:
-            fill_notes.append([f"{time:.2f}", "1", "2", "2", "1", "", "7"])  # Snare
+            fill_notes.append([f"{time:.2f}"] + FILL_SNARE)
             
             # Decrease interval as we approach the end
             interval = max(0.1, interval * 0.8)
             time += interval
         
         # End with crash
-        fill_notes.append([f"{end_time - 0.1:.2f}", "2", "5", "6", "1", "", "5"])  # Crash
+        fill_notes.append([f"{end_time - 0.1:.2f}"] + FILL_CRASH)
         
     elif fill_type == "tom_fill":
-        # Tom fill (different colors)
+        # Tom fill (different colors), drawn for the whole fill at once
         num_notes = int(fill_duration / 0.2)
-        colors = [["1", "3", "3"], ["1", "3", "4"], ["1", "4", "4"]]
-        
-        for i in range(num_notes):
-            time = start_time + i * 0.2
-            color = random.choice(colors)
-            
-            fill_notes.append([f"{time:.2f}", "1", color[1], color[2], "1", "", "7"])
+        toms = [FILL_TOMS[j] for j in rng.integers(len(FILL_TOMS), size=num_notes).tolist()]
+        fill_notes = [[f"{start_time + i * 0.2:.2f}"] + tom for i, tom in enumerate(toms)]
             
         # End with crash
-        fill_notes.append([f"{end_time - 0.1:.2f}", "2", "5", "6", "1", "", "5"])  # Crash
+        fill_notes.append([f"{end_time - 0.1:.2f}"] + FILL_CRASH)
             
     elif fill_type == "complex":
-        # Complex fill with varied elements
+        # Complex fill with varied elements, drawn for the whole fill at once
         num_notes = int(fill_duration / 0.15)
-        elements = [
-            ["1", "2", "2", "1", "", "7"],  # Kick
-            ["1", "2", "2", "1", "", "7"],  # Snare
-            ["1", "1", "1", "1", "", "6"],  # Hi-hat
-            ["2", "5", "6", "1", "", "5"],  # Crash
-        ]
-        
-        for i in range(num_notes):
-            time = start_time + i * 0.15
-            element = random.choice(elements)
-            
-            fill_notes.append([f"{time:.2f}"] + element)
+        elements = [FILL_ELEMENTS[j] for j in rng.integers(len(FILL_ELEMENTS), size=num_notes).tolist()]
+        fill_notes = [[f"{start_time + i * 0.15:.2f}"] + element for i, element in enumerate(elements)]
     
     return fill_notes
 
-def vary_note_density(notes_csv_path, sections, output_path=None):
+def vary_note_density(notes_csv_path, sections, output_path=None, rng=None):
     """
     Vary note density based on song sections
     
@@ -302,6 +404,7 @@ def vary_note_density(notes_csv_path, sections, output_path=None):
         notes_csv_path: Path to input notes.csv
         sections: List of (start, end, type) tuples
         output_path: Path for enhanced output
+        rng: Optional numpy random Generator (a fresh one is used if None)
         
     Returns:
         bool: Success or failure
@@ -311,83 +414,104 @@ def vary_note_density(notes_csv_path, sections, output_path=None):
             output_path = notes_csv_path
             
         # Load original notes
-        all_rows = []
-        with open(notes_csv_path, 'r') as f:
-            reader = csv.reader(f)
-            header = next(reader)
-            all_rows = list(reader)
-        
-        # Group notes by time
-        notes_by_time = defaultdict(list)
-        for row in all_rows:
-            if row and len(row) > 0:
-                try:
-                    time_val = float(row[0])
-                    notes_by_time[time_val].append(row)
-                except ValueError:
-                    pass
-        
-        # Process each section
-        varied_notes = []
-        
-        for i, (start_time, end_time, section_type) in enumerate(sections):
-            # Determine density factor for this section
-            if section_type == "A":
-                density = 1.0  # Normal density
-            elif section_type == "B":
-                density = 1.2  # 20% more notes
-            else:
-                density = 0.8  # 20% fewer notes
-            
-            # Apply density variation
-            for time, notes in notes_by_time.items():
-                if start_time <= time < end_time:
-                    if density < 1.0:
-                        # Reduce density - randomly remove some notes
-                        if random.random() > density:
-                            continue
-                        varied_notes.extend(notes)
-                    elif density > 1.0:
-                        # Increase density - add extra notes
-                        varied_notes.extend(notes)
-                        
-                        # Add extra notes with some probability
-                        if random.random() < (density - 1.0):
-                            # Add an extra note 1/8 note later
-                            extra_time = time + 0.125
-                            for note in notes:
-                                if note[1] == "1":  # If it's a normal note
-                                    extra_note = note.copy()
-                                    extra_note[0] = f"{extra_time:.2f}"
-                                    varied_notes.append(extra_note)
-                                    break
-                    else:
-                        # Keep normal density
-                        varied_notes.extend(notes)
-        
-        # Sort by time
-        varied_notes.sort(key=lambda row: float(row[0]) if row and len(row) > 0 else 0)
+        header, all_rows = read_notes_csv(notes_csv_path)
         
-        # Write back
-        with open(output_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(header)
-            writer.writerows(varied_notes)
+        varied_notes = vary_row_density(all_rows, sections, rng=rng)
         
-        logger.info(f"Varied note density, resulting in {len(varied_notes)} notes")
+        # Write back
+        write_notes_csv(output_path, header, varied_notes)
         return True
         
     except Exception as e:
         logger.error(f"Error varying note density: {e}")
         return False
 
-def enhance_pattern(notes_csv_path, output_path=None):
+def vary_row_density(all_rows, sections, rng=None):
+    """
+    Vary the density of note rows already in memory based on song sections
+    
+    Args:
+        all_rows: Note rows (without header)
+        sections: List of (start, end, type) tuples
+        rng: Optional numpy random Generator (a fresh one is used if None)
+        
+    Returns:
+        list: Varied rows sorted by time
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    # Group notes by time
+    notes_by_time = defaultdict(list)
+    for row in all_rows:
+        if row and len(row) > 0:
+            try:
+                time_val = float(row[0])
+                notes_by_time[time_val].append(row)
+            except ValueError:
+                pass
+    
+    # Order the time groups once so each section is a contiguous slice
+    group_times = sorted(notes_by_time)
+    
+    # Process each section
+    varied_notes = []
+    
+    for i, (start_time, end_time, section_type) in enumerate(sections):
+        # Determine density factor for this section
+        if section_type == "A":
+            density = 1.0  # Normal density
+        elif section_type == "B":
+            density = 1.2  # 20% more notes
+        else:
+            density = 0.8  # 20% fewer notes
+        
+        # Apply density variation to the groups inside this section
+        lo = bisect.bisect_left(group_times, start_time)
+        hi = bisect.bisect_left(group_times, end_time)
+        section_times = group_times[lo:hi]
+        if density < 1.0:
+            # Reduce density - randomly remove some notes
+            keep = rng.random(len(section_times)) <= density
+            for time, kept in zip(section_times, keep):
+                if kept:
+                    varied_notes.extend(notes_by_time[time])
+        elif density > 1.0:
+            # Increase density - add extra notes with some probability
+            extra = rng.random(len(section_times)) < (density - 1.0)
+            for time, add_extra in zip(section_times, extra):
+                notes = notes_by_time[time]
+                varied_notes.extend(notes)
+                
+                if add_extra:
+                    # Add an extra note 1/8 note later
+                    extra_time = time + 0.125
+                    for note in notes:
+                        if note[1] == "1":  # If it's a normal note
+                            extra_note = note.copy()
+                            extra_note[0] = f"{extra_time:.2f}"
+                            varied_notes.append(extra_note)
+                            break
+        else:
+            # Keep normal density
+            for time in section_times:
+                varied_notes.extend(notes_by_time[time])
+    
+    # Sort by time
+    varied_notes, _ = sort_rows_by_time(varied_notes)
+    
+    logger.info(f"Varied note density, resulting in {len(varied_notes)} notes")
+    return varied_notes
+
+def enhance_pattern(notes_csv_path, output_path=None, seed=None):
     """
     Main entry point for pattern enhancement
     
     Args:
         notes_csv_path: Path to input notes.csv
         output_path: Path for enhanced output (defaults to overwrite input)
+        seed: Optional seed; every random choice of the run comes from one
+              generator seeded with it, so equal seeds give equal output
         
     Returns:
         bool: Success or failure
@@ -396,41 +520,37 @@ def enhance_pattern(notes_csv_path, output_path=None):
         if output_path is None:
             output_path = notes_csv_path
         
-        # Create an intermediate file for each step
-        temp_dir = os.path.dirname(output_path)
-        temp_file = os.path.join(temp_dir, "temp_pattern.csv")
-        
         # Step 1: Identify sections
-        sections = identify_pattern_sections(notes_csv_path)
+        identified_sections = identify_pattern_sections(notes_csv_path)
+        sections = identified_sections
         
         if not sections:
             logger.warning("Could not identify sections, using default")
             # Create default sections
             sections = [(0, 30, "A"), (30, 60, "B"), (60, 90, "A"), (90, 120, "B")]
         
-        # Step 2: Add fills and variations (save to temp)
-        if not add_fills_and_variations(notes_csv_path, temp_file):
+        # Every step works on the rows in memory; the CSV is written once
+        header, rows = read_notes_csv(notes_csv_path)
+        rng = np.random.default_rng(seed)
+        
+        # Step 2: Add fills and variations
+        if identified_sections:
+            try:
+                rows = add_fills_to_rows(rows, identified_sections, rng=rng)
+            except Exception as e:
+                logger.error(f"Error adding fills and variations: {e}")
+                logger.warning("Failed to add fills, continuing with original")
+        else:
             logger.warning("Failed to add fills, continuing with original")
-            temp_file = notes_csv_path
             
-        # Step 3: Vary note density
-        if not vary_note_density(temp_file, sections, output_path):
+        # Step 3: Vary note density (keeping the previous rows if it fails)
+        try:
+            rows = vary_row_density(rows, sections, rng=rng)
+        except Exception as e:
+            logger.error(f"Error varying note density: {e}")
             logger.warning("Failed to vary density")
-            
-            # If this fails but we have a temp file, use that
-            if temp_file != notes_csv_path and os.path.exists(temp_file):
-                try:
-                    import shutil
-                    shutil.copy(temp_file, output_path)
-                except:
-                    pass
-        
-        # Clean up temp file
-        if temp_file != notes_csv_path and os.path.exists(temp_file):
-            try:
-                os.remove(temp_file)
-            except:
-                pass
+        
+        write_notes_csv(output_path, header, rows)
         
         return True
         
@@ -444,10 +564,11 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Enhance note patterns with variations")
     parser.add_argument("notes_csv", help="Path to input notes.csv file")
     parser.add_argument("--output", help="Path for output file (defaults to overwriting input)")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible variations")
     
     args = parser.parse_args()
     
-    success = enhance_pattern(args.notes_csv, args.output)
+    success = enhance_pattern(args.notes_csv, args.output, seed=args.seed)
     
     if success:
         print(f"Successfully enhanced note pattern")
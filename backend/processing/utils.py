@@ -71,6 +71,25 @@ def format_percentage(value, precision=1):
     """
     return format_safe(value, precision, "%")
 
+def get_audio_duration(audio_path):
+    """
+    Read an audio file's duration from its header, without decoding it
+    
+    Args:
+        audio_path: Path to the audio file
+    
+    Returns:
+        float: Duration in seconds, or None if it can't be read
+    """
+    try:
+        from mutagen import File as MutagenFile
+        audio = MutagenFile(audio_path)
+        if audio is not None and audio.info.length > 0:
+            return float(audio.info.length)
+    except Exception as e:
+        logger.debug(f"Could not read duration of {audio_path} with mutagen: {e}")
+    return None
+
 def create_formatignore_file(directory=None):
     """
     Create a .formatignore file with patterns to ignore in formatter checks
@@ -0,0 +1,154 @@
+"""
+Tests for processing.notes_generator.
+"""
+import os
+import stat
+
+import numpy as np
+import pytest
+
+from processing import notes_generator
+
+sf = pytest.importorskip("soundfile")
+pytest.importorskip("librosa")
+
+
+@pytest.fixture
+def song_path(tmp_path):
+    """Write a 12 s, 120 BPM drum loop over a sustained tone to a WAV file."""
+    sr = 22050
+    rng = np.random.default_rng(0)
+    t = np.arange(12 * sr) / sr
+    y = 0.2 * np.sin(2 * np.pi * 220 * t) * (1 + 0.5 * np.sin(2 * np.pi * 0.3 * t))
+    y += 0.05 * rng.standard_normal(len(t))
+    
+    kick_len, hat_len = int(0.1 * sr), int(0.05 * sr)
+    kick_env = np.exp(-np.arange(kick_len) / (0.02 * sr))
+    hat_env = np.exp(-np.arange(hat_len) / (0.01 * sr))
+    for beat in np.arange(0, 12, 0.5):
+        i = int(beat * sr)
+        y[i:i + kick_len] += kick_env * np.sin(2 * np.pi * 60 * np.arange(kick_len) / sr)
+        y[i:i + kick_len] += 0.3 * kick_env * rng.standard_normal(kick_len)
+        j = int((beat + 0.25) * sr)
+        y[j:j + hat_len] += 0.4 * hat_env * rng.standard_normal(hat_len)
+    
+    path = tmp_path / "song.wav"
+    sf.write(str(path), (0.5 * y).astype(np.float32), sr)
+    return path
+
+
+@pytest.fixture
+def drum_synced(tmp_path, monkeypatch):
+    """Enable drum-synced generation with a private analysis cache."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(notes_generator, "DRUM_SYNCED_NOTES_ENABLED", True)
+    monkeypatch.setattr(notes_generator, "ANALYSIS_CACHE_DIR", cache_dir)
+    monkeypatch.setattr(notes_generator, "_SPLEETER_IMPORT_FAILED", True)
+    # Keep the generators' c:/temp debug log inside tmp_path
+    monkeypatch.chdir(tmp_path)
+    return cache_dir
+
+
+def test_cached_analysis_gives_identical_chart(song_path, drum_synced, tmp_path):
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+    
+    assert notes_generator.generate_notes_csv(str(song_path), None, str(first))
+    assert notes_generator.generate_notes_csv(str(song_path), None, str(second))
+    
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_cache_miss_writes_one_entry(song_path, drum_synced, tmp_path, monkeypatch):
+    saves = []
+    save = notes_generator._save_cached_analysis
+    monkeypatch.setattr(notes_generator, "_save_cached_analysis",
+                        lambda *args, **kwargs: saves.append(args) or save(*args, **kwargs))
+    
+    assert notes_generator.generate_notes_csv(str(song_path), None, str(tmp_path / "notes.csv"))
+    assert len(saves) == 1
+    assert saves[0][-1] is not None  # Entry holds the percussive signal
+    assert len(list(drum_synced.glob("*.npz"))) == 1
+    
+    # A warm run has nothing new to store
+    assert notes_generator.generate_notes_csv(str(song_path), None, str(tmp_path / "again.csv"))
+    assert len(saves) == 1
+
+
+def _fail_fallback(*args, **kwargs):
+    raise AssertionError("fell back to the adaptive basic pattern")
+
+
+def _fail_midi(*args, **kwargs):
+    raise AssertionError("parsed the MIDI file with drum-synced generation disabled")
+
+
+def test_disabled_flag_uses_basic_pattern(song_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(notes_generator, "ANALYSIS_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    monkeypatch.setattr(notes_generator, "generate_adaptive_basic_pattern",
+                        lambda *args, **kwargs: calls.append(args) or True)
+    monkeypatch.setattr(notes_generator, "extract_midi_beats", _fail_midi)
+    midi_path = tmp_path / "song.mid"
+    midi_path.write_bytes(b"")
+    
+    assert notes_generator.generate_notes_csv(str(song_path), str(midi_path), str(tmp_path / "notes.csv"))
+    assert len(calls) == 1
+    assert not (tmp_path / "cache").exists()
+
+
+def test_drum_synced_notes_follow_the_audio(song_path, drum_synced, tmp_path, monkeypatch):
+    monkeypatch.setattr(notes_generator, "generate_adaptive_basic_pattern", _fail_fallback)
+    output = tmp_path / "notes.csv"
+    
+    assert notes_generator.generate_notes_csv(str(song_path), None, str(output))
+    
+    data = output.read_bytes()
+    assert data.startswith(notes_generator.NOTES_CSV_HEADER)
+    times = [float(line.split(b",")[0])
+             for line in data[len(notes_generator.NOTES_CSV_HEADER):].splitlines()]
+    assert times
+    assert times == sorted(times)
+    assert times[0] >= 3.0 and times[-1] < 12.0
+
+
+def test_spleeter_drums_with_cold_and_warm_cache(song_path, drum_synced, tmp_path, monkeypatch):
+    monkeypatch.setattr(notes_generator, "generate_adaptive_basic_pattern", _fail_fallback)
+    drums, _ = notes_generator._load_audio(str(song_path), sr=notes_generator.ANALYSIS_SAMPLE_RATE)
+    monkeypatch.setattr(notes_generator, "try_extract_drums_with_spleeter",
+                        lambda song_path, sr=None: drums)
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+    
+    assert notes_generator.generate_notes_csv(str(song_path), None, str(first))
+    entry = notes_generator._load_cached_analysis(notes_generator._analysis_cache_path(str(song_path)))
+    assert entry is not None
+    assert entry[-1] is None  # No percussive separation was needed
+    
+    assert notes_generator.generate_notes_csv(str(song_path), None, str(second))
+    assert first.read_bytes() == second.read_bytes()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="file modes are POSIX-only")
+def test_notes_csv_permissions_follow_umask(tmp_path):
+    output = tmp_path / "notes.csv"
+    old_umask = os.umask(0o027)
+    try:
+        assert notes_generator.generate_fixed_basic_notes_csv(str(output), 10.0)
+    finally:
+        os.umask(old_umask)
+    
+    assert stat.S_IMODE(output.stat().st_mode) == 0o640
+
+
+def test_entry_points_accept_path_objects(song_path, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    
+    for name, generate in (("notes", lambda song, out: notes_generator.generate_notes_csv(song, None, out)),
+                           ("basic", notes_generator.generate_basic_notes_csv)):
+        from_path = tmp_path / f"{name}_path.csv"
+        from_str = tmp_path / f"{name}_str.csv"
+        assert generate(song_path, from_path)
+        assert generate(str(song_path), str(from_str))
+        assert from_path.read_bytes() == from_str.read_bytes()